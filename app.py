@@ -1,69 +1,18 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import fitdecode
 import zipfile
-import io
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
+
+# NOTE: Only streamlit and the stdlib are imported eagerly.
+# fit_core (fitdecode) and pandas are imported inside process_garmin_data, and
+# plotly.express at the start of the plotting section. streamlit already loads
+# plotly.graph_objects itself, but not plotly.express, pandas or numpy, so the
+# first page render skips those until a file is actually analyzed.
+# (bench_startup.py shows what each import set loads and costs.)
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="Re-Connect: Garmin Health Explorer", layout="wide")
 
-# --- CORE PARSER (The Timekeeper) ---
-def parse_fit_file(file_bytes, source_name):
-    data = []
-    current_time = None
-    
-    try:
-        # Fast Peek for File Type
-        with fitdecode.FitReader(file_bytes) as fit:
-            is_monitoring = False
-            for frame in fit:
-                if isinstance(frame, fitdecode.FitDataMessage):
-                    if frame.name == 'file_id':
-                        type_val = frame.get_value('type')
-                        if type_val == 'monitoring_b' or type_val == 15:
-                            is_monitoring = True
-                        break
-            if not is_monitoring:
-                return []
-
-        # Deep Parse
-        with fitdecode.FitReader(file_bytes) as fit:
-            for frame in fit:
-                if isinstance(frame, fitdecode.FitDataMessage):
-                    if frame.name == 'monitoring':
-                        record_time = None
-                        
-                        # Timestamp Logic
-                        if frame.has_field('timestamp'):
-                            raw_ts = frame.get_value('timestamp')
-                            if raw_ts:
-                                current_time = raw_ts
-                                record_time = current_time
-                        elif frame.has_field('timestamp_16') and current_time:
-                            ts_16 = frame.get_value('timestamp_16')
-                            curr_ts_int = int(current_time.timestamp())
-                            delta = (ts_16 - curr_ts_int) & 0xFFFF
-                            current_time = current_time + timedelta(seconds=delta)
-                            record_time = current_time
-                            
-                        # Extraction Logic
-                        if record_time and frame.has_field('heart_rate'):
-                            hr = frame.get_value('heart_rate')
-                            
-                            # --- Only keep valid physiology (> 0) ---
-                            if hr is not None and hr > 0:
-                                data.append({
-                                    'timestamp': record_time,
-                                    'heart_rate': hr,
-                                    'source': source_name
-                                })
-    except Exception:
-        return []
-    return data
-
 # --- MAIN PROCESSOR (Cached) ---
 @st.cache_data(show_spinner=False)
 def process_garmin_data(zip_source, limit=None, is_local=False):
@@ -73,7 +22,9 @@ def process_garmin_data(zip_source, limit=None, is_local=False):
     3. Applies 'Newest First' limit (takes the last N files).
     4. Processes data.
     """
-    all_hr_data = []
+    import pandas as pd
+    from fit_core import discover_fit_files, extract_hr_records
+
     logs = []
     
     # Progress placeholders (we must create them here, but they won't update if cached)
@@ -90,25 +41,10 @@ def process_garmin_data(zip_source, limit=None, is_local=False):
 
         # 2. Discovery Phase (Scan Structure)
         status_text.text("🔍 Discovery Phase: Scanning all zip parts...")
-        part_files = [f for f in zf.namelist() if "UploadedFiles" in f and f.endswith(".zip")]
-        part_files.sort()
-        
-        # Build Master List of (PartName, FitFileName)
-        master_file_list = []
-        
-        # We need to open every part briefly to get its file list. 
-        # This is fast (just reading directory headers).
-        for i, part in enumerate(part_files):
-            inner_bytes = zf.read(part)
-            inner_zf = zipfile.ZipFile(io.BytesIO(inner_bytes))
-            fits = [f for f in inner_zf.namelist() if f.lower().endswith('.fit')]
-            fits.sort()
-            
-            for f in fits:
-                master_file_list.append( (part, f) )
-        
+        master_file_list, part_count = discover_fit_files(zf)
+
         total_found = len(master_file_list)
-        logs.append(f"Found {total_found} total FIT files across {len(part_files)} archives.")
+        logs.append(f"Found {total_found} total FIT files across {part_count} archives.")
         
         # 3. Apply Limit (Newest Data Priority)
         if limit is not None and limit < total_found:
@@ -121,36 +57,7 @@ def process_garmin_data(zip_source, limit=None, is_local=False):
 
         # 4. Processing Phase
         status_text.text(f"🚀 Processing {len(files_to_process)} files...")
-        
-        # Optimization: Group by Part to avoid re-opening zips constantly
-        # We reorganize our flat list back into a structure {PartName: [Files...]}
-        grouped_tasks = {}
-        for part, fname in files_to_process:
-            if part not in grouped_tasks:
-                grouped_tasks[part] = []
-            grouped_tasks[part].append(fname)
-            
-        # Iterate
-        processed_count = 0
-        total_tasks = len(files_to_process)
-        
-        for part_name, fit_files in grouped_tasks.items():
-            # Open Part Once
-            inner_bytes = zf.read(part_name)
-            inner_zf = zipfile.ZipFile(io.BytesIO(inner_bytes))
-            
-            for fit_name in fit_files:
-                # Update Progress
-                progress = processed_count / total_tasks
-                progress_bar.progress(progress)
-                
-                # Parse
-                with inner_zf.open(fit_name) as f:
-                    file_data = parse_fit_file(f.read(), fit_name)
-                    if file_data:
-                        all_hr_data.extend(file_data)
-                
-                processed_count += 1
+        all_hr_data = extract_hr_records(zf, files_to_process, on_progress=progress_bar.progress)
 
         progress_bar.empty()
         status_text.empty()
@@ -311,6 +218,8 @@ if st.session_state['analysis_active'] and zip_source:
             daily['coverage'] = (daily['count'] / mins_in_window * 100).clip(upper=100).round(1)
             
             # --- PLOTTING ---
+            import plotly.express as px
+
             st.subheader("📈 Heart Rate Trends")
             
             fig = px.scatter(daily, x='date', y='mean',
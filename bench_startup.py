@@ -0,0 +1,69 @@
+import subprocess
+import sys
+import os
+
+# --- CONFIGURATION ---
+# Each case is timed in a fresh interpreter so we measure true cold-start import cost.
+RUNS = 5
+CASES = {
+    # Baseline: whatever the interpreter (site, .pth files) loads before our code runs
+    "empty interpreter": "pass",
+    "decoder only (fitdecode)": "import fitdecode",
+    # Everything a worker needs to call parse_fit_file and nothing else
+    "worker parsing only": "from fit_core import parse_fit_file",
+    "worker core (fit_core)": "import fit_core",
+    # Exactly what app.py imports at module level (first page render, before an upload)
+    "first page render (app.py imports)": "import streamlit, zipfile, os, datetime",
+    # What app.py used to import at module level before the lazy-import split
+    "old eager app imports": "import streamlit, pandas, plotly.express, fitdecode, zipfile, io, os, datetime",
+}
+
+# Modules worth knowing about: if one shows up in a case that shouldn't need it,
+# deferring its import elsewhere saves nothing.
+HEAVY_MODULES = ["fitdecode", "zipfile", "numpy", "pandas", "pyarrow", "plotly", "streamlit"]
+
+TIMER = """
+import sys
+import time
+_t0 = time.perf_counter()
+{stmt}
+_elapsed = time.perf_counter() - _t0
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+print(_elapsed)
+"""
+
+def time_case(stmt):
+    """
+    Runs the statement in a new interpreter.
+    Returns (elapsed seconds, loaded heavy modules, None) on success
+    or (None, None, last stderr line) on failure.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(stmt=stmt, heavy=HEAVY_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return None, None, lines[-1] if lines else f"exit code {result.returncode}"
+    loaded, elapsed = result.stdout.strip().splitlines()[-2:]
+    return float(elapsed), loaded, None
+
+def run_benchmark():
+    print(f"--- Cold-start benchmark ({RUNS} runs each, best time shown) ---")
+
+    for label, stmt in CASES.items():
+        results = [time_case(stmt) for _ in range(RUNS)]
+        timings = [t for t, _, _ in results if t is not None]
+
+        if not timings:
+            error = next(err for _, _, err in results if err)
+            print(f"{label:<40} SKIPPED ({error})")
+            continue
+
+        loaded = next(mods for _, mods, _ in results if mods is not None)
+        print(f"{label:<40} {min(timings) * 1000:8.1f} ms   loaded: {loaded or '-'}")
+
+if __name__ == "__main__":
+    run_benchmark()
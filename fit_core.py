@@ -0,0 +1,134 @@
+import fitdecode
+from datetime import timedelta
+
+# --- LIGHTWEIGHT CORE ---
+# Parsing and ingestion only. This module must stay importable without
+# streamlit, pandas or plotly so workers and batch runs only pay for fitdecode.
+# zipfile/io are imported inside the ingestion helpers, since a worker that
+# only calls parse_fit_file never touches them.
+
+# --- FILE TYPE CHECK ---
+def is_monitoring_file(file_bytes):
+    """Fast peek at the File ID to see if this is a monitoring_b file."""
+    with fitdecode.FitReader(file_bytes) as fit:
+        for frame in fit:
+            if isinstance(frame, fitdecode.FitDataMessage):
+                if frame.name == 'file_id':
+                    type_val = frame.get_value('type')
+                    return type_val == 'monitoring_b' or type_val == 15
+    return False
+
+# --- CORE PARSER (The Timekeeper) ---
+def parse_fit_file(file_bytes, source_name):
+    data = []
+    current_time = None
+
+    try:
+        # Fast Peek for File Type
+        if not is_monitoring_file(file_bytes):
+            return []
+
+        # Deep Parse
+        with fitdecode.FitReader(file_bytes) as fit:
+            for frame in fit:
+                if isinstance(frame, fitdecode.FitDataMessage):
+                    if frame.name == 'monitoring':
+                        record_time = None
+
+                        # Timestamp Logic
+                        if frame.has_field('timestamp'):
+                            raw_ts = frame.get_value('timestamp')
+                            if raw_ts:
+                                current_time = raw_ts
+                                record_time = current_time
+                        elif frame.has_field('timestamp_16') and current_time:
+                            ts_16 = frame.get_value('timestamp_16')
+                            curr_ts_int = int(current_time.timestamp())
+                            delta = (ts_16 - curr_ts_int) & 0xFFFF
+                            current_time = current_time + timedelta(seconds=delta)
+                            record_time = current_time
+
+                        # Extraction Logic
+                        if record_time and frame.has_field('heart_rate'):
+                            hr = frame.get_value('heart_rate')
+
+                            # --- Only keep valid physiology (> 0) ---
+                            if hr is not None and hr > 0:
+                                data.append({
+                                    'timestamp': record_time,
+                                    'heart_rate': hr,
+                                    'source': source_name
+                                })
+    except Exception:
+        return []
+    return data
+
+# --- INGESTION ---
+def discover_fit_files(zf):
+    """
+    Scans ALL 'UploadedFiles' zip parts and returns a chronological
+    list of (PartName, FitFileName) plus the number of parts scanned.
+    """
+    import zipfile
+    import io
+
+    part_files = [f for f in zf.namelist() if "UploadedFiles" in f and f.endswith(".zip")]
+    part_files.sort()
+
+    # Build Master List of (PartName, FitFileName)
+    master_file_list = []
+
+    # We need to open every part briefly to get its file list.
+    # This is fast (just reading directory headers).
+    for part in part_files:
+        inner_bytes = zf.read(part)
+        inner_zf = zipfile.ZipFile(io.BytesIO(inner_bytes))
+        fits = [f for f in inner_zf.namelist() if f.lower().endswith('.fit')]
+        fits.sort()
+
+        for f in fits:
+            master_file_list.append( (part, f) )
+
+    return master_file_list, len(part_files)
+
+def extract_hr_records(zf, files_to_process, on_progress=None):
+    """
+    Parses the given (PartName, FitFileName) list and returns the raw HR records.
+    on_progress(fraction) is called before each file, if provided.
+    """
+    import zipfile
+    import io
+
+    all_hr_data = []
+
+    # Optimization: Group by Part to avoid re-opening zips constantly
+    # We reorganize our flat list back into a structure {PartName: [Files...]}
+    grouped_tasks = {}
+    for part, fname in files_to_process:
+        if part not in grouped_tasks:
+            grouped_tasks[part] = []
+        grouped_tasks[part].append(fname)
+
+    # Iterate
+    processed_count = 0
+    total_tasks = len(files_to_process)
+
+    for part_name, fit_files in grouped_tasks.items():
+        # Open Part Once
+        inner_bytes = zf.read(part_name)
+        inner_zf = zipfile.ZipFile(io.BytesIO(inner_bytes))
+
+        for fit_name in fit_files:
+            # Update Progress
+            if on_progress:
+                on_progress(processed_count / total_tasks)
+
+            # Parse
+            with inner_zf.open(fit_name) as f:
+                file_data = parse_fit_file(f.read(), fit_name)
+                if file_data:
+                    all_hr_data.extend(file_data)
+
+            processed_count += 1
+
+    return all_hr_data